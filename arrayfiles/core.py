@@ -1,12 +1,33 @@
+import codecs
 import csv
 import functools
-import io
+import locale
 import mmap
 import os
-from typing import Any, Dict, Iterator, List, Optional, Union
+import struct
+import sys
+import tempfile
+import weakref
+from array import array
+from stat import S_IMODE, S_ISREG
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
 
 from arrayfiles import utils
 
+# Files smaller than this are read into memory instead of being mapped.
+_MMAP_THRESHOLD = 64 * 1024
+# The size of a transparent huge page on x86-64 and most arm64 Linux kernels.
+_HUGEPAGE_SIZE = 2 * 1024 * 1024
+# The number of lines decoded at once by TextFile.iterate.
+_BATCH_SIZE = 1024
+# The number of bytes decoded at once by TextFile.__iter__.
+_CHUNK_SIZE = 1024 * 1024
+
+# Mappings and offset tables shared by every object reading the same file, keyed by
+# (st_dev, st_ino, st_size, st_mtime_ns). Entries go away with the last object using them.
+_MAPPINGS: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+_OFFSETS: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+
 
 class TextFile:
     """Load a line-oriented text file.
@@ -14,53 +35,299 @@ class TextFile:
     Args:
         path (str): The path to the text file.
         encoding (str, optional): The name of the encoding used to decode.
+        cache_size (int, optional): The number of decoded lines to keep in an LRU cache. It defaults to 0 (disabled).
+        index_cache (bool, optional): If ``True``, the line offsets are saved to ``<path>.idx`` and reused.
     """
 
-    def __init__(self, path: str, encoding: Optional[str] = 'utf-8') -> None:
-        path = os.path.expanduser(path)
-        assert os.path.exists(path)
+    _newline = b'\n'
+    # The width in bytes of a code unit, 2 for utf-16 and 4 for utf-32. Newlines only start on its multiples.
+    _unit = 1
+    # Whether a '\r' before the newline is dropped, as io.open does for files written on Windows.
+    _strips_cr = True
+    # The byte offset and the index in the offsets of the first line.
+    _start = 0
+    _first = 0
+    # The key of the shared mapping, or None if the file was read into memory.
+    _file_key = None
+    # The (st_ino, st_size, st_mtime_ns) of the file the offsets were built for.
+    _signature = None
+    # The cached attributes computed from the contents of the file.
+    _contents_attributes = ('_offsets', '_length')
+
+    def __init__(self,
+                 path: str,
+                 encoding: Optional[str] = 'utf-8',
+                 cache_size: Optional[int] = 0,
+                 index_cache: Optional[bool] = False) -> None:
+        self._path = os.path.expanduser(path)
+        # Like io.open, fall back on the locale encoding.
+        self._encoding = encoding or locale.getpreferredencoding(False)
+        self._cache_size = cache_size
+        self._index_cache = index_cache
+        self._newline = self._encode('\n')
+        self._unit = len(self._newline)
+        # Open the file right away so that a missing or unreadable file is reported here.
+        self._mm
+        self._enable_cache()
+
+    @utils.cached_property
+    def _mm(self) -> Union[mmap.mmap, bytes]:
+        with utils.fd_open(self._path, os.O_RDONLY) as fd:
+            stat = os.fstat(fd)
+            self._check_signature((stat.st_ino, stat.st_size, stat.st_mtime_ns))
+            if S_ISREG(stat.st_mode) and (stat.st_size < _MMAP_THRESHOLD or not stat.st_size):
+                # Reading is cheaper than setting up and faulting in a mapping, and bytes supports
+                # the same slicing and find as mmap. Files that report a size of 0 can't be mapped,
+                # but procfs and sysfs files have contents all the same. Other kinds of files go on
+                # to mmap, which rejects them.
+                self._file_key = None
+                chunks = []
+                while True:
+                    # A read may return less than asked for, so read until the end of the file.
+                    chunk = os.read(fd, stat.st_size or _CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+                return b''.join(chunks)
+            key = (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+            mm = _MAPPINGS.get(key)
+            if mm is None:
+                mm = _MAPPINGS[key] = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+                if len(mm) > _HUGEPAGE_SIZE:
+                    # Fewer TLB misses when lines are fetched from all over a large file.
+                    utils.madvise(mm, 'MADV_HUGEPAGE')
+        self._file_key = key
+        return mm
+
+    def _check_signature(self, signature: tuple) -> None:
+        # An unpickled object reopens the file by path, which may have been replaced since.
+        # Offsets built for the old file would slice the new one at the wrong places.
+        if self._signature is not None and self._signature != signature:
+            for name in self._contents_attributes:
+                self.__dict__.pop(name, None)
+        self._signature = signature
+
+    def _encode(self, text: str) -> bytes:
+        # Drop the byte order mark that codecs such as utf-16 put in front of every encoded string.
+        return text.encode(self._encoding)[len(''.encode(self._encoding)):]
+
+    def _find(self, sub: bytes, start: int) -> int:
+        # Like find, but skips matches that don't start on a code unit boundary.
+        mm = self._mm
+        index = mm.find(sub, start)
+        while index != -1 and index % self._unit:
+            index = mm.find(sub, index + 1)
+        return index
+
+    def _strip_cr(self, lines: List[str]) -> List[str]:
+        return [line[:-1] if line[-1:] == '\r' else line for line in lines]
+
+    def _enable_cache(self) -> None:
+        if self._cache_size:
+            self.getline = functools.lru_cache(maxsize=self._cache_size)(self.getline)
 
-        self._path = path
-        self._encoding = encoding
-        with utils.fd_open(path, os.O_RDWR) as fd:
-            self._mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+    def _get_typecode(self) -> str:
+        # Offsets into files under 4 GiB fit in 4 bytes, which halves the size of the index.
+        if len(self._mm) + len(self._newline) < 2 ** 32 and array('I').itemsize == 4:
+            return 'I'
+        return 'q'
 
-    def _get_offsets(self) -> List[int]:
+    def _scan_offsets(self) -> array:
         mm = self._mm
-        mm.seek(0)
-        return [0] + [mm.tell() for _ in iter(mm.readline, b'')]
+        newline = self._newline
+        newline_offset = len(newline)
 
-    @property
-    @functools.lru_cache()
-    def _offsets(self) -> List[int]:
+        offsets = array(self._get_typecode(), [0])
+        # readline moves the position of the mapping, which may be shared with other threads.
+        scan = self._map_privately() if newline == b'\n' and isinstance(mm, mmap.mmap) else None
+        if scan is not None:
+            with scan:
+                # Only the private mapping is advised, the shared one may be in use by iterating objects.
+                utils.madvise(scan, 'MADV_SEQUENTIAL')
+                offsets.fromlist([scan.tell() for _ in iter(scan.readline, b'')])
+                # readline also stops at the end of the file, which needn't follow a newline.
+                start = scan.rfind(newline, 0) + newline_offset
+            if start < len(mm):
+                offsets.pop()
+        else:
+            find = self._find
+            start = 0
+            while True:
+                temp = find(newline, start)
+                if temp == -1:
+                    break
+                start = temp + newline_offset
+                offsets.append(start)
+
+        # Every line is sliced as offsets[i]:offsets[i + 1] - len(newline), so an unterminated
+        # last line is given a virtual newline past the end of the file.
+        if start < len(mm):
+            offsets.append(len(mm) + newline_offset)
+        return offsets
+
+    def _map_privately(self) -> Optional[mmap.mmap]:
+        # Returns None if the file was replaced since the shared mapping was opened.
+        try:
+            with utils.fd_open(self._path, os.O_RDONLY) as fd:
+                stat = os.fstat(fd)
+                if (stat.st_ino, stat.st_size, stat.st_mtime_ns) != self._signature:
+                    return None
+                return mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        except OSError:
+            return None
+
+    def _get_index_header(self) -> bytes:
+        # Describe the file as it was when it was read or mapped, not as it is now.
+        self._mm
+        _, size, mtime_ns = self._signature
+        typecode = self._get_typecode().encode('ascii')
+        # Newlines are matched on code unit boundaries, so the same bytes may give other offsets.
+        header = struct.pack('<qqcII', size, mtime_ns, typecode, self._unit, len(self._newline))
+        return header + self._newline
+
+    def _has_index(self, header: bytes) -> bool:
+        try:
+            with open(self._path + '.idx', 'rb') as fp:
+                return fp.read(len(header)) == header
+        except OSError:
+            return False
+
+    def _load_index(self, header: bytes) -> Optional[array]:
+        try:
+            with open(self._path + '.idx', 'rb') as fp:
+                if fp.read(len(header)) != header:
+                    return None
+                data = fp.read()
+        except OSError:
+            return None
+        offsets = array(self._get_typecode())
+        try:
+            offsets.frombytes(data)
+        except ValueError:
+            return None
+        if sys.byteorder == 'big':
+            offsets.byteswap()
+        return offsets
+
+    def _save_index(self, header: bytes, offsets: array) -> None:
+        if sys.byteorder == 'big':
+            offsets = array(offsets.typecode, offsets)
+            offsets.byteswap()
+        index_path = self._path + '.idx'
+        try:
+            # Next to the index, as os.replace can't move files across file systems.
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(index_path) or os.curdir)
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, 'wb') as fp:
+                fp.write(header)
+                offsets.tofile(fp)
+            # mkstemp creates the file readable by its owner only. Whoever can read the
+            # data can read its index too.
+            os.chmod(temp_path, S_IMODE(os.stat(self._path).st_mode) & 0o666)
+            # Readers either see the previous index or the complete new one.
+            os.replace(temp_path, index_path)
+        except OSError:
+            os.remove(temp_path)
+
+    def _load_offsets(self) -> array:
+        if not self._index_cache:
+            return self._scan_offsets()
+        # The header comes from the same fstat as the data, so a later write invalidates the saved index.
+        header = self._get_index_header()
+        offsets = self._load_index(header)
+        if offsets is None:
+            offsets = self._scan_offsets()
+            self._save_index(header, offsets)
+        return offsets
+
+    def _get_offsets(self) -> array:
+        # Newlines only start on code unit boundaries, so encodings with the same newline bytes
+        # but different code unit widths get different offsets.
+        key = self._file_key and (self._file_key, self._newline, self._unit)
+        offsets = _OFFSETS.get(key) if key else None
+        if offsets is None:
+            offsets = self._load_offsets()
+            if key:
+                # Objects scanning at the same time each build a table, then share the first one stored.
+                offsets = _OFFSETS.setdefault(key, offsets)
+        elif self._index_cache:
+            # The table may have been built by an object that doesn't save its index.
+            header = self._get_index_header()
+            if not self._has_index(header):
+                self._save_index(header, offsets)
+        return offsets
+
+    @utils.cached_property
+    def _offsets(self) -> array:
         return self._get_offsets()
 
     def _get_length(self) -> int:
-        return len(self._offsets) - 1
+        # An empty file has no header line to skip.
+        return max(len(self._offsets) - 1 - self._first, 0)
 
-    @property
-    @functools.lru_cache()
+    @utils.cached_property
     def _length(self) -> int:
         return self._get_length()
 
     def __iter__(self) -> Iterator[str]:
-        with io.open(self._path, encoding=self._encoding) as fp:
-            for line in fp:
-                yield line.rstrip(os.linesep)
+        return self._iter_lines()
+
+    def _iter_lines(self, keepends: bool = False) -> Iterator[str]:
+        # Stream over the mapping so that a single pass doesn't need the offset index.
+        mm = self._mm
+        newline = self._newline.decode(self._encoding)
+        decoder = codecs.getincrementaldecoder(self._encoding)()
+        if self._start:
+            # Starting past the byte order mark, so hand the decoder the one its codec writes.
+            decoder.decode(''.encode(self._encoding))
+        # The unterminated tail is collected in pieces and joined once its newline shows up,
+        # so a line spanning many chunks isn't copied and searched again for each of them.
+        # Only the last len(newline) - 1 characters are searched again, in case a newline
+        # straddles two chunks.
+        keep = len(newline) - 1
+        strips_cr = self._strips_cr and not keepends
+        pieces: List[str] = []
+        carry = ''
+        for start in range(self._start, len(mm), _CHUNK_SIZE):
+            text = carry + decoder.decode(mm[start: start + _CHUNK_SIZE])
+            lines = text.split(newline)
+            rest = lines.pop()
+            if lines:
+                if pieces:
+                    lines[0] = ''.join(pieces) + lines[0]
+                    pieces = []
+                # The '\r' of the first line may have come with an earlier chunk.
+                if strips_cr and ('\r' in text or lines[0][-1:] == '\r'):
+                    lines = self._strip_cr(lines)
+                if keepends:
+                    for line in lines:
+                        yield line + newline
+                else:
+                    yield from lines
+            cut = len(rest) - keep
+            if cut > 0:
+                pieces.append(rest[:cut])
+                rest = rest[cut:]
+            carry = rest
+        rest = ''.join(pieces) + carry + decoder.decode(b'', final=True)
+        # A lone '\r' is a last line of its own, which is empty once the '\r' is dropped.
+        if rest:
+            yield rest[:-1] if strips_cr and rest[-1:] == '\r' else rest
 
     def iterate(self, start: int, end: int) -> Iterator[str]:
         if start > end:
             raise ValueError('end should be larger than start.')
-        self._mm.seek(self._offsets[start])
-        readline = self._mm.readline
-        tell = self._mm.tell
-        end = self._offsets[end] if end < len(self._offsets) else self._offsets[-1]
-        while tell() != end:
-            yield readline().decode(self._encoding).rstrip(os.linesep)
+        end = min(end, self._length)
+        for i in range(start, end, _BATCH_SIZE):
+            yield from self._getlines(i, min(i + _BATCH_SIZE, end))
 
     def __getitem__(self, index: Union[int, slice]) -> Union[str, List[str]]:
         if isinstance(index, slice):
             start, stop, step = index.indices(self._length)
+            if step == 1:
+                return self._getlines(start, stop)
             return [self.getline(i) for i in range(start, stop, step)]
 
         if index >= 0:
@@ -73,26 +340,57 @@ class TextFile:
 
         return self.getline(index)
 
+    def getitems(self, indices: Iterable[int]) -> List[str]:
+        length = self._length
+        getline = self.getline
+        lines = []
+        for index in indices:
+            if not -length <= index < length:
+                raise IndexError('Text object index out of range')
+            lines.append(getline(index if index >= 0 else index + length))
+        return lines
+
     def getline(self, i: int) -> str:
-        start, end = self._offsets[i: i + 2]
-        return self._mm[start: end].decode(self._encoding).rstrip(os.linesep)
+        offsets = self._offsets
+        i += self._first
+        line = self._mm[offsets[i]: offsets[i + 1] - len(self._newline)].decode(self._encoding)
+        if self._strips_cr and line[-1:] == '\r':
+            return line[:-1]
+        return line
+
+    def _getlines(self, start: int, stop: int) -> List[str]:
+        if start >= stop:
+            return []
+        offsets = self._offsets
+        newline = self._newline
+        # Decode the whole span at once instead of one line at a time.
+        first = self._first
+        text = self._mm[offsets[start + first]: offsets[stop + first] - len(newline)].decode(self._encoding)
+        lines = text.split(newline.decode(self._encoding))
+        if self._strips_cr and '\r' in text:
+            return self._strip_cr(lines)
+        return lines
 
     def __len__(self) -> int:
         return self._length
 
     def __getstate__(self) -> Dict[str, Any]:
         state = self.__dict__.copy()
-        del state['_mm']
+        # The mapping is reopened on first access, while the offsets travel with the state.
+        state.pop('_mm', None)
+        state.pop('_file_key', None)
+        state.pop('getline', None)
         return state
 
     def __setstate__(self, state: Dict[str, Any]) -> None:
         self.__dict__.update(state)
-        with utils.fd_open(self._path, os.O_RDWR) as fd:
-            self._mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
-
-    def __del__(self) -> None:
-        if getattr(self, '_mm', None):
-            self._mm.close()
+        self._enable_cache()
+        try:
+            stat = os.stat(self._path)
+        except OSError:
+            # Reported when the file is reopened.
+            return
+        self._check_signature((stat.st_ino, stat.st_size, stat.st_mtime_ns))
 
 
 class CsvFile(TextFile):
@@ -103,45 +401,105 @@ class CsvFile(TextFile):
         encoding (str, optional): The name of the encoding used to decode.
         delimiter (str, optional): A one-character string used to separate fields. It defaults to ','.
         header (bool, optional): If ``True``, the csvfile will use the first line of the file as a header.
+        fieldnames (list, optional): custom header.
+        cache_size (int, optional): The number of decoded lines to keep in an LRU cache.
+        index_cache (bool, optional): If ``True``, the line offsets are saved to ``<path>.idx`` and reused.
     """
 
+    _contents_attributes = TextFile._contents_attributes + ('_splittable', '_first_line', '_start', '_fieldnames')
+
     def __init__(self,
                  path: str,
                  encoding: Optional[str] = 'utf-8',
                  delimiter: Optional[str] = ',',
                  header: Optional[bool] = False,
-                 fieldnames: Optional[List[str]] = None) -> None:
-        super().__init__(path, encoding)
+                 fieldnames: Optional[List[str]] = None,
+                 cache_size: Optional[int] = 0,
+                 index_cache: Optional[bool] = False) -> None:
+        super().__init__(path, encoding, cache_size, index_cache)
 
         self._delimiter = delimiter
         self._header = header
+        self._custom_fieldnames = fieldnames
         if header:
-            if fieldnames is None:
-                with io.open(path, encoding=encoding) as fp:
-                    fieldnames = next(csv.reader(fp, delimiter=delimiter))
-            # TODO: csv.DictReader skips blank lines.
-            # So the item length doesn't match if the given file includes black lines.
-            self._reader = functools.partial(csv.DictReader, delimiter=delimiter, fieldnames=fieldnames)
-        else:
-            self._reader = functools.partial(csv.reader, delimiter=delimiter)
+            # The header line is skipped by index, so the offsets stay shared with other objects.
+            self._first = 1
+        self._reader = functools.partial(csv.reader, delimiter=delimiter)
 
-    def _get_offsets(self) -> List[int]:
-        offsets = super(CsvFile, self)._get_offsets()
+    @utils.cached_property
+    def _first_line(self) -> bytes:
+        mm = self._mm
+        end = self._find(self._newline, 0)
+        return mm[:end + len(self._newline)] if end != -1 else mm[:]
+
+    @utils.cached_property
+    def _start(self) -> int:
+        return len(self._first_line) if self._header else 0
+
+    @utils.cached_property
+    def _fieldnames(self) -> Optional[tuple]:
+        if not self._header:
+            return None
+        fieldnames = self._custom_fieldnames
+        if fieldnames is None:
+            fieldnames = next(csv.reader([self._first_line.decode(self._encoding)], delimiter=self._delimiter))
+        # Interned keys let row lookups by a literal field name succeed on the identity check.
+        return tuple(sys.intern(name) if type(name) is str else name for name in fieldnames)
+
+    @utils.cached_property
+    def _splittable(self) -> bool:
+        # Without quote characters or carriage returns csv.reader does nothing but split on the delimiter.
+        mm = self._mm
+        return mm.find(self._encode('"'), 0) == -1 and mm.find(self._encode('\r'), 0) == -1
+
+    def _make_dict(self, row: List[str]) -> Dict[str, Any]:
+        # Mirrors csv.DictReader with its default restkey and restval.
+        fieldnames = self._fieldnames
+        d = dict(zip(fieldnames, row))
+        if len(fieldnames) < len(row):
+            d[None] = row[len(fieldnames):]
+        else:
+            for key in fieldnames[len(row):]:
+                d[key] = None
+        return d
+
+    def _split(self, lines: Iterable[str]) -> Iterator[List[str]]:
+        if self._splittable:
+            delimiter = self._delimiter
+            return (line.split(delimiter) if line else [] for line in lines)
+        return self._reader(lines)
+
+    def _parse(self, lines: Iterable[str]) -> Iterator[Union[List[Any], Dict[str, Any]]]:
+        rows = self._split(lines)
         if self._header:
-            offsets.pop(0)
-        return offsets
+            # TODO: Blank lines are skipped as csv.DictReader does.
+            # So the item length doesn't match if the given file includes blank lines.
+            return (self._make_dict(row) for row in rows if row)
+        return rows
 
     def __iter__(self) -> Iterator[Union[List[Any], Dict[str, Any]]]:
-        with io.open(self._path, encoding=self._encoding) as fp:
-            if self._header:
-                fp.readline()
-            yield from self._reader(fp)
+        # csv.reader needs the line endings to continue a quoted field on the next line.
+        yield from self._parse(self._iter_lines(keepends=not self._splittable))
+
+    def getitems(self, indices: Iterable[int]) -> List[Union[List[Any], Dict[str, Any]]]:
+        lines = super().getitems(indices)
+        if self._splittable:
+            rows = self._split(lines)
+        else:
+            # Each line is parsed on its own, as by __getitem__, so that an unbalanced quote
+            # doesn't carry over into the lines after it.
+            reader = self._reader
+            rows = (next(reader([line]), []) for line in lines)
+        if self._header:
+            # Blank rows come back as [], as from __getitem__, so that there is a row for every index.
+            return [self._make_dict(row) if row else [] for row in rows]
+        return list(rows)
 
     def __getitem__(self, index: Union[int, slice]) -> Union[List[Any], Dict[str, Any]]:
         x = super().__getitem__(index)
         if not isinstance(x, list):
             x = [x]
-        row = list(self._reader(x))
+        row = list(self._parse(x))
         if len(row) == 1:
             return row[0]
         return row
@@ -154,40 +512,38 @@ class CustomNewlineTextFile(TextFile):
         path (str): The path to the text file.
         newline (str): The newline letters.
         encoding (str, optional): The name of the encoding used to decode.
+        cache_size (int, optional): The number of decoded lines to keep in an LRU cache.
+        index_cache (bool, optional): If ``True``, the line offsets are saved to ``<path>.idx`` and reused.
     """
 
-    def __init__(self, path: str, newline: str, encoding: Optional[str] = 'utf-8') -> None:
-        super(CustomNewlineTextFile, self).__init__(path, encoding)
+    _strips_cr = False
 
-        self._newline = newline.encode(encoding)
+    def __init__(self,
+                 path: str,
+                 newline: str,
+                 encoding: Optional[str] = 'utf-8',
+                 cache_size: Optional[int] = 0,
+                 index_cache: Optional[bool] = False) -> None:
+        super(CustomNewlineTextFile, self).__init__(path, encoding, cache_size, index_cache)
 
-    def _get_offsets(self) -> List[int]:
-        mm = self._mm
-        mm.seek(0)
+        self._newline = self._encode(newline)
 
-        offsets = [0]
-        start = 0
-        newline = self._newline
-        newline_offset = len(newline)
-        while True:
-            temp = mm.find(newline, start)
-            if temp == -1:
-                break
-            start = temp + newline_offset
-            offsets.append(start)
-        return offsets
 
-    def __iter__(self) -> Iterator[str]:
-        mm = self._mm
-        for start, end in zip(self._offsets, self._offsets[1:]):
-            yield mm[start: end].decode(self._encoding).rstrip(os.linesep)
+def _load_eagerly(data: TextFile) -> List[Any]:
+    # The whole file is about to be read. Unlike the access pattern advice, this only starts
+    # reading ahead and leaves the mapping as it is for other objects sharing it.
+    utils.madvise(data._mm, 'MADV_WILLNEED')
+    # list() would call len() for a size hint, which builds the offset index.
+    return list(iter(data))
 
 
 def read_text(
     path: str,
     encoding: Optional[str] = 'utf-8',
     newline: Optional[str] = '\n',
-    lazy: Optional[bool] = True
+    lazy: Optional[bool] = True,
+    cache_size: Optional[int] = 0,
+    index_cache: Optional[bool] = False
 ) -> Union[TextFile, CustomNewlineTextFile, List[str]]:
     """Load a line-oriented text file.
 
@@ -197,6 +553,10 @@ def read_text(
         newline (str, optional): The newline letters.
         lazy (bool, optional): If ``True``, the function returns ``TextFile`` or
         ``CustomNewlineTextFile`` object. Otherwise, returns a list of string.
+        cache_size (int, optional): The number of decoded lines to keep in an LRU cache.
+        It only takes effect when ``lazy`` is ``True``.
+        index_cache (bool, optional): If ``True``, the line offsets are saved to ``<path>.idx`` and
+        reused by later calls as long as the file is unchanged.
 
     Returns (Union[TextFile, CustomNewlineTextFile, List[str]]):
         The loaded array-like accessible text file.
@@ -211,14 +571,14 @@ def read_text(
     """
 
     if newline == '\n':
-        data = TextFile(path, encoding)
+        data = TextFile(path, encoding, cache_size, index_cache)
     else:
-        data = CustomNewlineTextFile(path, newline, encoding)
+        data = CustomNewlineTextFile(path, newline, encoding, cache_size, index_cache)
 
     if lazy:
         return data
     else:
-        return list(data)
+        return _load_eagerly(data)
 
 
 def read_csv(
@@ -227,7 +587,9 @@ def read_csv(
     delimiter: Optional[str] = ',',
     header: Optional[bool] = False,
     fieldnames: Optional[List[str]] = None,
-    lazy: Optional[str] = True
+    lazy: Optional[str] = True,
+    cache_size: Optional[int] = 0,
+    index_cache: Optional[bool] = False
 ) -> Union[CsvFile, List[str]]:
     """Load a CSV file.
 
@@ -239,6 +601,10 @@ def read_csv(
         fieldnames (list, optional): custom header.
         lazy (bool, optional): If ``True``, the function returns ``TextFile`` or
         ``CustomNewlineTextFile`` object. Otherwise, returns a list of string.
+        cache_size (int, optional): The number of decoded lines to keep in an LRU cache.
+        It only takes effect when ``lazy`` is ``True``.
+        index_cache (bool, optional): If ``True``, the line offsets are saved to ``<path>.idx`` and
+        reused by later calls as long as the file is unchanged.
 
     Returns (Union[CsvFile, List[str]]):
         The loaded array-like accessible csv file.
@@ -252,9 +618,9 @@ def read_csv(
         [['the', '10th', 'row'], ['the', '12th', 'row']]
     """
 
-    data = CsvFile(path, encoding, delimiter, header, fieldnames)
+    data = CsvFile(path, encoding, delimiter, header, fieldnames, cache_size, index_cache)
 
     if lazy:
         return data
     else:
-        return list(data)
+        return _load_eagerly(data)
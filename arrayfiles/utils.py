@@ -1,11 +1,37 @@
 import contextlib
+import mmap
 import os
 
 
 @contextlib.contextmanager
 def fd_open(filename: str, flags, **kwargs) -> int:
+    fd = os.open(filename, flags, **kwargs)
     try:
-        fd = os.open(filename, flags, **kwargs)
         yield fd
     finally:
         os.close(fd)
+
+
+class cached_property:
+    # A backport of functools.cached_property, which is only available on Python 3.8+.
+
+    def __init__(self, func):
+        self.func = func
+        self.__doc__ = func.__doc__
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = instance.__dict__[self.func.__name__] = self.func(instance)
+        return value
+
+
+def madvise(mm: mmap.mmap, option: str) -> None:
+    flag = getattr(mmap, option, None)
+    # mmap.madvise and most MADV_* constants are only available on Python 3.8+ and on some platforms.
+    if flag is None or not hasattr(mm, 'madvise'):
+        return
+    try:
+        mm.madvise(flag)
+    except OSError:
+        pass
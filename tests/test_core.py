@@ -1,28 +1,57 @@
+import os
 import tempfile
-from unittest import TestCase
+from unittest import TestCase, mock, skipUnless
 
 import arrayfiles
 
 
 class TextTestCase(TestCase):
 
-    def setUp(self):
-        self.length = 100
+    @classmethod
+    def setUpClass(cls):
+        cls.length = 100
 
-        fp = tempfile.NamedTemporaryFile()
-        for i in range(self.length):
-            fp.write(f'line #{i}\n'.encode('utf-8'))
-        fp.seek(0)
-        self.fp = fp
+        fp = tempfile.NamedTemporaryFile(delete=False)
+        os.write(fp.fileno(), ''.join(f'line #{i}\n' for i in range(cls.length)).encode('utf-8'))
+        fp.close()
+        cls.fp = fp
 
-    def tearDown(self):
-        self.fp.close()
+    @classmethod
+    def tearDownClass(cls):
+        os.unlink(cls.fp.name)
 
     def test_dunder_init(self):
         text = arrayfiles.read_text(self.fp.name)
         self.assertEqual(text._path, self.fp.name)
         self.assertEqual(text._encoding, 'utf-8')
 
+    def test_raises_file_not_found_error(self):
+        with self.assertRaises(FileNotFoundError):
+            arrayfiles.read_text(self.fp.name + '.missing')
+
+    def test_opens_read_only_file(self):
+        with tempfile.NamedTemporaryFile() as fp:
+            fp.write(b'line #0\n')
+            fp.flush()
+            os.chmod(fp.name, 0o444)
+            text = arrayfiles.read_text(fp.name)
+            self.assertEqual(text[0], 'line #0')
+
+    def test_stores_offsets_compactly(self):
+        from array import array
+
+        text = arrayfiles.read_text(self.fp.name)
+        self.assertIsInstance(text._offsets, array)
+        self.assertEqual(text._offsets.itemsize, 4)
+        self.assertEqual(len(text._offsets), self.length + 1)
+
+    def test_stores_large_offsets(self):
+        text = arrayfiles.read_text(self.fp.name)
+        with mock.patch.object(arrayfiles.TextFile, '_get_typecode', return_value='q'), \
+                mock.patch.dict(arrayfiles.core._OFFSETS, clear=True):
+            self.assertEqual(text._offsets.itemsize, 8)
+        self.assertEqual(text[-1], f'line #{self.length - 1}')
+
     def test_supports_random_access(self):
         text = arrayfiles.read_text(self.fp.name)
         for i in range(self.length):
@@ -38,6 +67,23 @@ class TextTestCase(TestCase):
         text = arrayfiles.read_text(self.fp.name)
         self.assertSequenceEqual(text[:self.length], text)
 
+    def test_slices_contiguous_items(self):
+        text = arrayfiles.read_text(self.fp.name)
+        self.assertListEqual(text[10:20], [f'line #{i}' for i in range(10, 20)])
+        self.assertListEqual(text[-5:], [f'line #{i}' for i in range(self.length - 5, self.length)])
+        self.assertListEqual(text[::10], [f'line #{i}' for i in range(0, self.length, 10)])
+        self.assertListEqual(text[20:10], [])
+
+    def test_getitems(self):
+        text = arrayfiles.read_text(self.fp.name)
+        indices = [3, 1, -1, 50, 3]
+        self.assertListEqual(text.getitems(indices), [text[i] for i in indices])
+        self.assertListEqual(text.getitems([]), [])
+        with self.assertRaises(IndexError):
+            text.getitems([0, self.length])
+        with self.assertRaises(IndexError):
+            text.getitems([-self.length - 1])
+
     def test_iterates(self):
         text = arrayfiles.read_text(self.fp.name)
         with self.assertRaises(ValueError):
@@ -76,33 +122,315 @@ class TextTestCase(TestCase):
 
     def test_dunder_setstate(self):
         text = arrayfiles.read_text(self.fp.name)
+        self.assertEqual(len(text), self.length)
         state = text.__getstate__()
         self.assertNotIn('_mm', state)
+        self.assertIn('_offsets', state)
+
+        text = arrayfiles.TextFile.__new__(arrayfiles.TextFile)
         text.__setstate__(state)
+        self.assertNotIn('_mm', text.__dict__)
+        self.assertEqual(text[0], 'line #0')
         self.assertIn('_mm', text.__dict__)
 
+    def test_rescans_replaced_file_after_unpickling(self):
+        import pickle
+
+        with tempfile.NamedTemporaryFile() as fp:
+            fp.write(b'a\nb\n')
+            fp.flush()
+            text = arrayfiles.read_text(fp.name)
+            self.assertEqual(len(text), 2)
+            data = pickle.dumps(text)
+
+            fp.write(b'longer line\n')
+            fp.flush()
+            text = pickle.loads(data)
+            self.assertListEqual(text[:], ['a', 'b', 'longer line'])
+            self.assertEqual(len(text), 3)
+
+    def test_caches_decoded_lines(self):
+        import pickle
+
+        text = arrayfiles.read_text(self.fp.name, cache_size=10)
+        for _ in range(2):
+            for i in range(self.length):
+                self.assertEqual(text[i], f'line #{i}')
+        info = text.getline.cache_info()
+        self.assertEqual(info.maxsize, 10)
+        self.assertEqual(info.currsize, 10)
+
+        text = pickle.loads(pickle.dumps(text))
+        self.assertEqual(text[0], 'line #0')
+        self.assertEqual(text.getline.cache_info().currsize, 1)
+
+    def test_caches_index(self):
+        # The file is appended to below, so work on a copy of the fixture.
+        fp = tempfile.NamedTemporaryFile()
+        self.addCleanup(fp.close)
+        with open(self.fp.name, 'rb') as f:
+            fp.write(f.read())
+        fp.flush()
+        index_path = fp.name + '.idx'
+        self.addCleanup(lambda: os.path.exists(index_path) and os.remove(index_path))
+
+        os.chmod(fp.name, 0o644)
+        text = arrayfiles.read_text(fp.name, index_cache=True)
+        self.assertEqual(len(text), self.length)
+        self.assertTrue(os.path.exists(index_path))
+        self.assertEqual(os.stat(index_path).st_mode & 0o777, 0o644)
+
+        with mock.patch.object(arrayfiles.TextFile, '_scan_offsets', side_effect=AssertionError):
+            text = arrayfiles.read_text(fp.name, index_cache=True)
+            self.assertEqual(len(text), self.length)
+            self.assertEqual(text[-1], f'line #{self.length - 1}')
+
+        fp.write(b'one more line\n')
+        fp.flush()
+        text = arrayfiles.read_text(fp.name, index_cache=True)
+        self.assertEqual(len(text), self.length + 1)
+
+    def test_caches_index_of_opened_contents(self):
+        with tempfile.NamedTemporaryFile() as fp:
+            index_path = fp.name + '.idx'
+            self.addCleanup(lambda: os.path.exists(index_path) and os.remove(index_path))
+            fp.write(b'a\nb\n')
+            fp.flush()
+            text = arrayfiles.read_text(fp.name, index_cache=True)
+            fp.write(b'c\nd\n')
+            fp.flush()
+            self.assertEqual(len(text), 2)
+
+            text = arrayfiles.read_text(fp.name, index_cache=True)
+            self.assertEqual(len(text), 4)
+            self.assertListEqual(text[:], ['a', 'b', 'c', 'd'])
+
+    def test_caches_index_of_relative_path(self):
+        with tempfile.TemporaryDirectory() as dirname:
+            cwd = os.getcwd()
+            os.chdir(dirname)
+            self.addCleanup(os.chdir, cwd)
+            with open('data.txt', 'wb') as fp:
+                fp.write(b'a\nb\n')
+            with mock.patch('tempfile.tempdir', os.path.join(dirname, 'missing')):
+                text = arrayfiles.read_text('data.txt', index_cache=True)
+                self.assertEqual(len(text), 2)
+            self.assertTrue(os.path.exists('data.txt.idx'))
+            self.assertListEqual(sorted(os.listdir(os.curdir)), ['data.txt', 'data.txt.idx'])
+
     def test_eager_load(self):
         text1 = arrayfiles.read_text(self.fp.name, lazy=False)
         text2 = arrayfiles.read_text(self.fp.name, lazy=True)
         for a, b in zip(text1, text2):
             self.assertEqual(a, b)
 
+    def test_opens_file(self):
+        # The fixture is smaller than the mmap threshold.
+        text = arrayfiles.read_text(self.fp.name)
+        self.assertIsInstance(text._mm, bytes)
+
+    @skipUnless(os.path.exists('/proc/self/status'), 'requires procfs')
+    def test_reads_file_reporting_no_size(self):
+        # procfs reports a size of 0 for files that aren't empty.
+        text = arrayfiles.read_text('/proc/self/status')
+        self.assertGreater(len(text), 0)
+        self.assertTrue(text[0].startswith('Name:'))
+
+    def test_reads_until_end_of_file(self):
+        read = os.read
+        with mock.patch('os.read', side_effect=lambda fd, n: read(fd, min(n, 3))):
+            text = arrayfiles.read_text(self.fp.name)
+        self.assertEqual(len(text), self.length)
+        self.assertEqual(text[-1], f'line #{self.length - 1}')
+
+    def test_reads_empty_file(self):
+        with tempfile.NamedTemporaryFile() as fp:
+            text = arrayfiles.read_text(fp.name)
+            self.assertEqual(len(text), 0)
+            self.assertListEqual(list(text), [])
+            data = arrayfiles.read_csv(fp.name, header=True)
+            self.assertEqual(len(data), 0)
+            self.assertListEqual(list(data), [])
+            self.assertListEqual(data[:], [])
+            self.assertListEqual(arrayfiles.read_csv(fp.name, header=True, lazy=False), [])
+
+    def test_reads_locale_encoding(self):
+        with tempfile.NamedTemporaryFile() as fp:
+            fp.write(b'x\ny\n')
+            fp.flush()
+            self.assertListEqual(arrayfiles.read_text(fp.name, encoding=None, lazy=False), ['x', 'y'])
+            text = arrayfiles.read_text(fp.name, encoding=None)
+            self.assertListEqual(text[:], ['x', 'y'])
+
+    def test_reads_utf16_file(self):
+        lines = ['日本語', 'english', '']
+        with tempfile.NamedTemporaryFile() as fp:
+            fp.write(''.join(f'{x}\n' for x in lines).encode('utf-16'))
+            fp.flush()
+            self.assertListEqual(arrayfiles.read_text(fp.name, encoding='utf-16', lazy=False), lines)
+            text = arrayfiles.read_text(fp.name, encoding='utf-16')
+            self.assertEqual(len(text), len(lines))
+            self.assertListEqual(text[:], lines)
+
+    def test_skips_newline_bytes_inside_code_units(self):
+        # U+0A01 is encoded as b'\x01\x0a', so b'\n\x00' also matches across it and U+0100.
+        lines = ['\u0a01\u0100', 'x']
+        with tempfile.NamedTemporaryFile() as fp:
+            fp.write(''.join(f'{x}\n' for x in lines).encode('utf-16-le'))
+            fp.flush()
+            text = arrayfiles.read_text(fp.name, encoding='utf-16-le')
+            self.assertEqual(len(text), len(lines))
+            self.assertListEqual(text[:], lines)
+            self.assertListEqual([text[i] for i in range(len(text))], lines)
+            self.assertListEqual(list(text), lines)
+
+            text = arrayfiles.read_text(fp.name, encoding='utf-16-le', newline='\u0100')
+            self.assertListEqual(text[:], list(iter(text)))
+
+    def test_strips_carriage_returns(self):
+        with tempfile.NamedTemporaryFile() as fp:
+            fp.write(b'a\r\n\r\nb\r\r\r\nc\r')
+            fp.flush()
+            expected = ['a', '', 'b\r\r', 'c']
+            self.assertListEqual(arrayfiles.read_text(fp.name, lazy=False), expected)
+            text = arrayfiles.read_text(fp.name)
+            self.assertEqual(len(text), len(expected))
+            self.assertListEqual(text[:], expected)
+            self.assertListEqual([text[i] for i in range(len(text))], expected)
+            self.assertListEqual(list(text.iterate(0, len(text))), expected)
+            with mock.patch('arrayfiles.core._CHUNK_SIZE', 2):
+                self.assertListEqual(list(text), expected)
+
+        with tempfile.NamedTemporaryFile() as fp:
+            fp.write(b'a\n\r')
+            fp.flush()
+            expected = ['a', '']
+            self.assertListEqual(arrayfiles.read_text(fp.name, lazy=False), expected)
+            text = arrayfiles.read_text(fp.name)
+            self.assertEqual(len(text), len(expected))
+            self.assertListEqual(text[:], expected)
+            self.assertListEqual(list(text), expected)
+
+    def test_iterates_without_index(self):
+        text = arrayfiles.read_text(self.fp.name)
+        self.assertListEqual(list(iter(text)), [f'line #{i}' for i in range(self.length)])
+        self.assertNotIn('_offsets', text.__dict__)
 
-class CsvTestCase(TestCase):
+
+class MmapTextTestCase(TextTestCase):
 
     def setUp(self):
+        super().setUp()
+        patcher = mock.patch('arrayfiles.core._MMAP_THRESHOLD', 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_opens_file(self):
+        import mmap
+
+        text = arrayfiles.read_text(self.fp.name)
+        self.assertIsInstance(text._mm, mmap.mmap)
+
+    def test_builds_index_from_threads(self):
+        import sys
+        from concurrent.futures import ThreadPoolExecutor
+
+        length = 100000
+        with tempfile.NamedTemporaryFile() as fp:
+            fp.write(''.join(f'line #{i}\n' for i in range(length)).encode('utf-8'))
+            fp.flush()
+            texts = [arrayfiles.read_text(fp.name) for _ in range(4)]
+            interval = sys.getswitchinterval()
+            sys.setswitchinterval(1e-6)
+            try:
+                with ThreadPoolExecutor(len(texts)) as executor:
+                    lengths = list(executor.map(len, texts))
+            finally:
+                sys.setswitchinterval(interval)
+            self.assertListEqual(lengths, [length] * len(texts))
+            for text in texts:
+                self.assertEqual(text[-1], f'line #{length - 1}')
+
+    def test_shares_mapping(self):
+        text1 = arrayfiles.read_text(self.fp.name)
+        text2 = arrayfiles.read_text(self.fp.name)
+        self.assertIs(text1._mm, text2._mm)
+        self.assertIs(text1._offsets, text2._offsets)
+
+        data = arrayfiles.read_csv(self.fp.name, header=True)
+        self.assertIs(data._mm, text1._mm)
+        self.assertIs(data._offsets, text1._offsets)
+        self.assertEqual(len(data), self.length - 1)
+        self.assertEqual(len(text1._offsets), self.length + 1)
+
+        text3 = arrayfiles.read_text(self.fp.name, newline='#')
+        self.assertIs(text3._mm, text1._mm)
+        self.assertIsNot(text3._offsets, text1._offsets)
+
+    def test_shares_offsets_of_same_code_units(self):
+        with tempfile.NamedTemporaryFile() as fp:
+            # b'\n\x00' matches across the code units of U+0A01 and U+0100 as well.
+            fp.write('\u0a01\u0100\nx\n'.encode('utf-16-le'))
+            fp.flush()
+            text1 = arrayfiles.read_text(fp.name, encoding='latin-1', newline='\n\x00')
+            self.assertEqual(len(text1), 3)
+            text2 = arrayfiles.read_text(fp.name, encoding='utf-16-le')
+            self.assertIs(text2._mm, text1._mm)
+            self.assertIsNot(text2._offsets, text1._offsets)
+            self.assertEqual(len(text2), 2)
+            self.assertListEqual(text2[:], ['\u0a01\u0100', 'x'])
+
+    def test_saves_index_of_shared_offsets(self):
+        index_path = self.fp.name + '.idx'
+        self.addCleanup(lambda: os.path.exists(index_path) and os.remove(index_path))
+        text1 = arrayfiles.read_text(self.fp.name)
+        self.assertEqual(len(text1), self.length)
+        text2 = arrayfiles.read_text(self.fp.name, index_cache=True)
+        self.assertIs(text2._offsets, text1._offsets)
+        self.assertTrue(os.path.exists(index_path))
+
+        del text1, text2
+        with mock.patch.object(arrayfiles.TextFile, '_scan_offsets', side_effect=AssertionError):
+            text = arrayfiles.read_text(self.fp.name, index_cache=True)
+            self.assertEqual(text[-1], f'line #{self.length - 1}')
+
+    def test_keeps_advice_of_shared_mapping(self):
+        with mock.patch('arrayfiles.utils.madvise') as madvise:
+            text = arrayfiles.read_text(self.fp.name)
+            self.assertEqual(len(text), self.length)
+            self.assertEqual(len(list(text)), self.length)
+            arrayfiles.read_text(self.fp.name, lazy=False)
+        advice = [call.args[1] for call in madvise.call_args_list if call.args[0] is text._mm]
+        self.assertNotIn('MADV_RANDOM', advice)
+        self.assertNotIn('MADV_SEQUENTIAL', advice)
+
+    def test_shares_offsets_with_header(self):
+        data = arrayfiles.read_csv(self.fp.name, header=True)
+        self.assertEqual(len(data), self.length - 1)
+        with mock.patch.object(arrayfiles.TextFile, '_scan_offsets', side_effect=AssertionError):
+            text = arrayfiles.read_text(self.fp.name)
+            self.assertIs(text._offsets, data._offsets)
+            self.assertEqual(text[0], 'line #0')
+            self.assertEqual(data[0], {'line #0': 'line #1'})
+            self.assertEqual(len(text), self.length)
+
+
+class CsvTestCase(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
         lines = ['en,ja',
                  'this is English .,this is Japanese .',
                  'this is also English .,this is also Japanese .']
-        self.lines = lines
-        fp = tempfile.NamedTemporaryFile()
-        for x in lines:
-            fp.write(f'{x}\n'.encode('utf-8'))
-        fp.seek(0)
-        self.fp = fp
+        cls.lines = lines
+        fp = tempfile.NamedTemporaryFile(delete=False)
+        os.write(fp.fileno(), ''.join(f'{x}\n' for x in lines).encode('utf-8'))
+        fp.close()
+        cls.fp = fp
 
-    def tearDown(self):
-        self.fp.close()
+    @classmethod
+    def tearDownClass(cls):
+        os.unlink(cls.fp.name)
 
     def test_dunder_init(self):
         data = arrayfiles.read_csv(self.fp.name)
@@ -119,6 +447,25 @@ class CsvTestCase(TestCase):
         data = arrayfiles.read_csv(self.fp.name, header=True)
         self.assertTrue(data._header)
 
+    def test_interns_fieldnames(self):
+        data = arrayfiles.read_csv(self.fp.name, header=True)
+        self.assertTupleEqual(data._fieldnames, ('en', 'ja'))
+        self.assertIs(data._fieldnames[0], 'en')
+        self.assertIs(next(iter(data[0])), 'en')
+
+        data = arrayfiles.read_csv(self.fp.name, header=True, fieldnames=[0, 1])
+        self.assertTupleEqual(data._fieldnames, (0, 1))
+        self.assertEqual(data[0], {0: self.lines[1].split(',')[0], 1: self.lines[1].split(',')[1]})
+
+    def test_reads_header_in_locale_encoding(self):
+        with tempfile.NamedTemporaryFile() as fp:
+            fp.write(b'a,b\n1,2\n')
+            fp.flush()
+            self.assertListEqual(arrayfiles.read_csv(fp.name, encoding=None, header=True, lazy=False),
+                                 [{'a': '1', 'b': '2'}])
+            data = arrayfiles.read_csv(fp.name, encoding=None, header=True)
+            self.assertEqual(data[0], {'a': '1', 'b': '2'})
+
     def test_iterates_csv_with_header(self):
         from collections import OrderedDict
 
@@ -130,6 +477,27 @@ class CsvTestCase(TestCase):
             self.assertEqual(x, y)
             self.assertEqual(data[i], y)
 
+    def test_getitems(self):
+        data = arrayfiles.read_csv(self.fp.name, header=True)
+        self.assertListEqual(data.getitems([1, 0]), [data[1], data[0]])
+
+        with tempfile.NamedTemporaryFile() as fp:
+            fp.write(b'x,y\na,b\n\nc,d\n')
+            fp.flush()
+            data = arrayfiles.read_csv(fp.name, header=True)
+            indices = [2, 1, 0]
+            self.assertListEqual(data.getitems(indices), [data[i] for i in indices])
+            self.assertListEqual(data.getitems(indices), [{'x': 'c', 'y': 'd'}, [], {'x': 'a', 'y': 'b'}])
+
+        with tempfile.NamedTemporaryFile() as fp:
+            fp.write(b'x,y\n"a,b\nc,d\ne,f\n')
+            fp.flush()
+            data = arrayfiles.read_csv(fp.name)
+            self.assertFalse(data._splittable)
+            indices = [0, 1, 2, 3]
+            self.assertListEqual(data.getitems(indices), [data[i] for i in indices])
+            self.assertEqual(len(data.getitems(indices)), len(indices))
+
     def test_iterates_csv_without_header(self):
         data = arrayfiles.read_csv(self.fp.name, header=False)
         expected = [line.split(',') for line in self.lines]
@@ -137,6 +505,76 @@ class CsvTestCase(TestCase):
         for x, y in zip(data, expected):
             self.assertEqual(x, y)
 
+    def test_pickles_without_rescanning(self):
+        import pickle
+        data = arrayfiles.read_csv(self.fp.name, header=True)
+        self.assertEqual(len(data), len(self.lines) - 1)
+        with mock.patch.object(arrayfiles.CsvFile, '_scan_offsets', side_effect=AssertionError):
+            data = pickle.loads(pickle.dumps(data))
+            self.assertNotIn('_mm', data.__dict__)
+            self.assertEqual(data[-1], dict(zip(self.lines[0].split(','), self.lines[-1].split(','))))
+
+    def test_rereads_header_of_replaced_file(self):
+        import pickle
+
+        with tempfile.NamedTemporaryFile() as fp:
+            fp.write(b'a,b\n1,2\n')
+            fp.flush()
+            data = arrayfiles.read_csv(fp.name, header=True)
+            self.assertListEqual(list(data), [{'a': '1', 'b': '2'}])
+            state = pickle.dumps(data)
+
+            with open(fp.name, 'wb') as f:
+                f.write(b'long,names\n3,4\n5,6\n')
+            data = pickle.loads(state)
+            self.assertTupleEqual(data._fieldnames, ('long', 'names'))
+            expected = [{'long': '3', 'names': '4'}, {'long': '5', 'names': '6'}]
+            self.assertListEqual(list(data), expected)
+            self.assertListEqual(data[:], expected)
+
+    def test_splits_rows_like_csv_reader(self):
+        import csv
+
+        lines = ['a,b,c', '', 'd,e', 'f,g,h,i']
+        with tempfile.NamedTemporaryFile() as fp:
+            fp.write(('\n'.join(lines) + '\n').encode('utf-8'))
+            fp.flush()
+            data = arrayfiles.read_csv(fp.name)
+            self.assertTrue(data._splittable)
+            self.assertListEqual(data[:], list(csv.reader(lines)))
+            data = arrayfiles.read_csv(fp.name, header=True)
+            self.assertListEqual([dict(x) for x in data[:]], [dict(x) for x in csv.DictReader(lines)])
+
+    def test_parses_quoted_fields(self):
+        with tempfile.NamedTemporaryFile() as fp:
+            fp.write(b'x,y\n"a,b",c\n\nd\n')
+            fp.flush()
+            data = arrayfiles.read_csv(fp.name)
+            self.assertFalse(data._splittable)
+            self.assertListEqual(data[1], ['a,b', 'c'])
+            data = arrayfiles.read_csv(fp.name, header=True)
+            self.assertListEqual(list(data), [{'x': 'a,b', 'y': 'c'}, {'x': 'd', 'y': None}])
+
+    def test_iterates_multiline_quoted_fields(self):
+        import csv
+
+        content = 'x,y,z\na,"x\ny",b\nc,"\n",d\n'
+        with tempfile.NamedTemporaryFile() as fp:
+            fp.write(content.encode('utf-8'))
+            fp.flush()
+            self.assertListEqual(arrayfiles.read_csv(fp.name, lazy=False),
+                                 list(csv.reader(content.splitlines(True))))
+            self.assertListEqual([dict(x) for x in arrayfiles.read_csv(fp.name, header=True, lazy=False)],
+                                 [dict(x) for x in csv.DictReader(content.splitlines(True))])
+
+    def test_reads_utf16_file(self):
+        with tempfile.NamedTemporaryFile() as fp:
+            fp.write(''.join(f'{x}\n' for x in self.lines).encode('utf-16'))
+            fp.flush()
+            data = arrayfiles.read_csv(fp.name, encoding='utf-16', header=True, lazy=False)
+            header = self.lines[0].split(',')
+            self.assertListEqual(data, [dict(zip(header, line.split(','))) for line in self.lines[1:]])
+
     def test_eager_load(self):
         text1 = arrayfiles.read_csv(self.fp.name, lazy=False)
         text2 = arrayfiles.read_csv(self.fp.name, lazy=True)
@@ -146,18 +584,19 @@ class CsvTestCase(TestCase):
 
 class CustomNewlineTextTestCase(TestCase):
 
-    def setUp(self):
-        self.length = 100
+    @classmethod
+    def setUpClass(cls):
+        cls.length = 100
 
-        fp = tempfile.NamedTemporaryFile()
-        for i in range(self.length):
-            fp.write(f'line #{i}\n\n'.encode('utf-8'))
-        fp.seek(0)
-        self.fp = fp
-        self.newline = '\n\n'
+        fp = tempfile.NamedTemporaryFile(delete=False)
+        os.write(fp.fileno(), ''.join(f'line #{i}\n\n' for i in range(cls.length)).encode('utf-8'))
+        fp.close()
+        cls.fp = fp
+        cls.newline = '\n\n'
 
-    def tearDown(self):
-        self.fp.close()
+    @classmethod
+    def tearDownClass(cls):
+        os.unlink(cls.fp.name)
 
     def test_dunder_len(self):
         text = arrayfiles.read_text(self.fp.name, newline=self.newline)
@@ -170,6 +609,39 @@ class CustomNewlineTextTestCase(TestCase):
         for i, (x, y) in enumerate(zip(text, text[:None])):
             self.assertEqual(x, y, f'line #{i}')
 
+    def test_iterates_across_chunks(self):
+        lines = ['日本語', '\nαβγ', '', 'english', 'a long line ' * 10, '\n' + 'x' * 9, 'end\n']
+        with tempfile.NamedTemporaryFile() as fp:
+            fp.write('\n\n'.join(lines).encode('utf-8'))
+            fp.flush()
+            text = arrayfiles.read_text(fp.name, newline=self.newline)
+            with mock.patch('arrayfiles.core._CHUNK_SIZE', 4):
+                self.assertListEqual(list(iter(text)), lines)
+            self.assertListEqual(text[:], lines)
+
+    def test_strips_newline(self):
+        with tempfile.NamedTemporaryFile() as fp:
+            fp.write(b'a|b||c')
+            fp.flush()
+            text = arrayfiles.read_text(fp.name, newline='|')
+            expected = ['a', 'b', '', 'c']
+            self.assertEqual(len(text), len(expected))
+            self.assertListEqual(text[:], expected)
+            self.assertListEqual([text[i] for i in range(len(text))], expected)
+            self.assertListEqual(list(text), expected)
+
+    def test_reads_last_line_shorter_than_newline(self):
+        for content, newline, expected in [(b'a\n\n\n', '\n\n', ['a', '\n']),
+                                           (b'xaaa', 'aa', ['x', 'a'])]:
+            with tempfile.NamedTemporaryFile() as fp:
+                fp.write(content)
+                fp.flush()
+                text = arrayfiles.read_text(fp.name, newline=newline)
+                self.assertEqual(len(text), len(expected))
+                self.assertListEqual(text[:], expected)
+                self.assertListEqual([text[i] for i in range(len(text))], expected)
+                self.assertListEqual(list(text), expected)
+
     def test_eager_load(self):
         text1 = arrayfiles.read_text(self.fp.name, newline=self.newline, lazy=False)
         text2 = arrayfiles.read_text(self.fp.name, newline=self.newline, lazy=True)
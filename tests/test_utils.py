@@ -1,3 +1,4 @@
+import mmap
 import os
 import tempfile
 from unittest import TestCase
@@ -16,3 +17,32 @@ class UtilsTestCase(TestCase):
     def test_open(self):
         with utils.fd_open(self.fp.name, os.O_RDWR) as fd:
             self.assertIsInstance(fd, int)
+
+    def test_open_raises_original_error(self):
+        with self.assertRaises(FileNotFoundError):
+            with utils.fd_open(self.fp.name + '.missing', os.O_RDONLY):
+                pass
+
+    def test_cached_property(self):
+        class A:
+            calls = 0
+
+            @utils.cached_property
+            def value(self):
+                self.calls += 1
+                return self.calls
+
+        a = A()
+        self.assertEqual(a.value, 1)
+        self.assertEqual(a.value, 1)
+        self.assertIn('value', a.__dict__)
+
+    def test_madvise(self):
+        self.fp.write(b'madvise')
+        self.fp.flush()
+        with utils.fd_open(self.fp.name, os.O_RDONLY) as fd:
+            mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        utils.madvise(mm, 'MADV_RANDOM')
+        utils.madvise(mm, 'MADV_UNKNOWN')
+        self.assertEqual(mm[:], b'madvise')
+        mm.close()